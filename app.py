@@ -1,346 +1,622 @@
-import asyncio
-import threading
-
-import pandas as pd
-import streamlit as st
-import plotly.graph_objects as go
-
-from backend.db import get_db, init_db
-from backend.ingestion import listen_to_binance
-from backend.analytics import (
-    load_ticks,
-    resample_candles,
-    compute_zscore,
-    compute_rolling_correlation,
-    compute_hedge_ratio,
-    compute_pair_spread,
-    compute_spread_zscore,
-    run_adf_test,
-)
-
-# ---------------- Helpers ----------------
-def normalize_ohlc_columns(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Normalize OHLC column names to:
-    open, high, low, close, volume
-    Accepts common variants: Open/High/Low/Close/Volume and price/qty.
-    """
-    df = df.copy()
-    column_map = {
-        "Open": "open",
-        "High": "high",
-        "Low": "low",
-        "Close": "close",
-        "Volume": "volume",
-        "open": "open",
-        "high": "high",
-        "low": "low",
-        "close": "close",
-        "volume": "volume",
-        "price": "close",
-        "qty": "volume",
-    }
-    df.rename(columns=column_map, inplace=True)
-    return df
-
-
-def ensure_required_candle_columns(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Ensure required candle columns exist. If volume missing, fill with 0.
-    """
-    df = normalize_ohlc_columns(df)
-
-    if "close" not in df.columns:
-        raise ValueError("OHLC data must contain a 'close' column (or 'Close'/'price').")
-
-    # For uploaded OHLC, volume might be missing; allow charts by filling.
-    if "volume" not in df.columns:
-        df["volume"] = 0.0
-
-    # If open/high/low missing, approximate from close (still allows charts)
-    for c in ["open", "high", "low"]:
-        if c not in df.columns:
-            df[c] = df["close"]
-
-    return df
-
-
-# ---------------- Page ----------------
-st.set_page_config(page_title="Quant Dashboard", layout="wide")
-st.title("📊 Quant Developer Dashboard")
-
-# ---------------- DB init ----------------
-db = get_db()
-init_db(db)
-
-# ---------------- Auto ingestion (BTC + ETH) ----------------
-@st.cache_resource
-def start_ingestion():
-    def run():
-        async def main():
-            await asyncio.gather(
-                listen_to_binance("btcusdt"),
-                listen_to_binance("ethusdt"),
-            )
-        asyncio.run(main())
-
-    t = threading.Thread(target=run, daemon=True)
-    t.start()
-
-start_ingestion()
-
-# ---------------- Controls ----------------
-st.subheader("📂 Optional OHLC Upload (CSV)")
-uploaded_file = st.file_uploader("Upload OHLC CSV (optional)", type=["csv"])
-
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    symbol = st.selectbox("Select Symbol (single-asset analytics)", ["btcusdt", "ethusdt"])
-
-with col2:
-    timeframe_label = st.selectbox("Select Timeframe", ["1 Second", "1 Minute", "5 Minutes"])
-
-with col3:
-    regression_type = st.selectbox("Regression Type (pair analytics)", ["OLS"])  # keep OLS stable here
-
-timeframe_map = {
-    "1 Second": "1s",
-    "1 Minute": "1min",
-    "5 Minutes": "5min",
-}
-timeframe = timeframe_map[timeframe_label]
-
-rolling_window = st.slider(
-    "Rolling Window (number of candles)",
-    min_value=10,
-    max_value=300,
-    value=60,
-    step=5,
-)
-
-st.subheader("🚨 Z-Score Alert Settings")
-alert_threshold = st.slider(
-    "Alert when |Z-score| exceeds",
-    min_value=0.5,
-    max_value=5.0,
-    value=2.0,
-    step=0.1,
-)
-
-# ---------------- Load & build candles (primary) ----------------
-candles = None
-
-if uploaded_file is not None:
-    # Upload mode
-    try:
-        df_up = pd.read_csv(uploaded_file)
-        # require a timestamp column
-        # supported names: ts / timestamp / time
-        ts_col = None
-        for c in ["ts", "timestamp", "time", "datetime"]:
-            if c in df_up.columns:
-                ts_col = c
-                break
-        if ts_col is None:
-            st.error("Uploaded CSV must contain a timestamp column: ts OR timestamp OR time OR datetime.")
-            st.stop()
-
-        df_up[ts_col] = pd.to_datetime(df_up[ts_col])
-        df_up = df_up.set_index(ts_col).sort_index()
-
-        candles = ensure_required_candle_columns(df_up)
-
-        st.info("Using uploaded OHLC data (live ingestion still runs in background).")
-    except Exception as e:
-        st.error(f"Failed to read uploaded OHLC CSV: {e}")
-        st.stop()
-else:
-    # Live DB mode
-    df_ticks = load_ticks(symbol)
-    if df_ticks.empty:
-        st.warning("No data found yet. Live ingestion is running… wait ~5–10 seconds and rerun.")
-        st.stop()
-
-    candles = resample_candles(df_ticks, timeframe)
-    candles = ensure_required_candle_columns(candles)
-
-# Guard
-if candles is None or candles.empty:
-    st.warning("Not enough data to build candles yet.")
-    st.stop()
-
-# Single-asset Z-score
-candles = compute_zscore(candles, window=rolling_window)
-
-# ---------------- Pair data (always from DB) ----------------
-df_ticks_eth = load_ticks("ethusdt")
-eth_available = not df_ticks_eth.empty
-
-pair_ready = False
-candles_eth = None
-corr_df = None
-beta = None
-spread_df = None
-
-if eth_available:
-    candles_eth = resample_candles(df_ticks_eth, timeframe)
-    candles_eth = ensure_required_candle_columns(candles_eth)
-
-    # Need enough points for rolling computations
-    if len(candles_eth) >= rolling_window and len(candles) >= rolling_window:
-        pair_ready = True
-    else:
-        st.warning("ETH data exists but not enough candles for pair analytics yet. Keep running for a bit.")
-else:
-    st.warning("ETH data not available yet. Pair analytics will appear once data arrives.")
-
-# ---------------- Pair analytics (only if ready) ----------------
-if pair_ready:
-    corr_df = compute_rolling_correlation(candles, candles_eth, window=rolling_window)
-
-    # Hedge ratio
-    # (regression_type kept as OLS for stability; can be expanded)
-    beta = compute_hedge_ratio(candles["close"], candles_eth["close"])
-
-    spread_df = compute_pair_spread(candles, candles_eth, beta)
-    spread_df = compute_spread_zscore(spread_df, window=rolling_window)
-
-# ---------------- Charts: Single asset ----------------
-st.subheader(f"Price Candles — {symbol.upper()} ({timeframe})")
-fig = go.Figure()
-fig.add_trace(
-    go.Candlestick(
-        x=candles.index,
-        open=candles["open"],
-        high=candles["high"],
-        low=candles["low"],
-        close=candles["close"],
-        name="Price",
-    )
-)
-fig.update_layout(height=520, xaxis_title="Time", yaxis_title="Price")
-st.plotly_chart(fig, use_container_width=True)
-
-st.subheader("Volume")
-vol_fig = go.Figure()
-vol_fig.add_trace(go.Bar(x=candles.index, y=candles["volume"], name="Volume"))
-vol_fig.update_layout(height=260, xaxis_title="Time", yaxis_title="Volume")
-st.plotly_chart(vol_fig, use_container_width=True)
-
-st.subheader("Z-Score (Rolling)")
-z_fig = go.Figure()
-z_fig.add_trace(
-    go.Scatter(
-        x=candles.index,
-        y=candles["zscore"],
-        mode="lines",
-        name="Z-Score",
-    )
-)
-z_fig.add_hline(y=2, line_dash="dash")
-z_fig.add_hline(y=-2, line_dash="dash")
-z_fig.add_hline(y=0, line_dash="dot")
-z_fig.update_layout(height=260, xaxis_title="Time", yaxis_title="Z-Score")
-st.plotly_chart(z_fig, use_container_width=True)
-
-# Alerts (single asset)
-latest_z = float(candles["zscore"].iloc[-1])
-if abs(latest_z) >= alert_threshold:
-    st.error(f"🚨 ALERT: |Z-score| = {latest_z:.2f} exceeds threshold {alert_threshold}")
-else:
-    st.success(f"Z-score normal: {latest_z:.2f}")
-
-# ---------------- Pair section (only show if ready) ----------------
-st.divider()
-st.subheader("Pair Analytics (BTC vs ETH)")
-
-if not pair_ready:
-    st.info("Pair analytics will appear automatically once ETH candles are available and sufficient for the rolling window.")
-    st.stop()
-
-# Hedge ratio metric
-st.subheader("📐 Hedge Ratio (OLS)")
-if beta is None or pd.isna(beta):
-    st.metric("BTC ~ β × ETH", "Waiting…")
-else:
-    st.metric("BTC ~ β × ETH", f"{beta:.4f}")
-
-# Trading signal summary (brownie points)
-st.subheader("🧠 Trading Signal Summary")
-latest_spread_z = float(spread_df["spread_zscore"].iloc[-1])
-
-if latest_spread_z <= -2:
-    st.success(
-        f"📈 MEAN-REVERSION BUY SIGNAL\n\n"
-        f"Spread Z-Score = {latest_spread_z:.2f}\n"
-        f"Interpretation: Spread is significantly BELOW mean."
-    )
-elif latest_spread_z >= 2:
-    st.error(
-        f"📉 MEAN-REVERSION SELL SIGNAL\n\n"
-        f"Spread Z-Score = {latest_spread_z:.2f}\n"
-        f"Interpretation: Spread is significantly ABOVE mean."
-    )
-else:
-    st.info(
-        f"⚖️ NEUTRAL / NO-TRADE ZONE\n\n"
-        f"Spread Z-Score = {latest_spread_z:.2f}\n"
-        f"Interpretation: Spread within normal range."
-    )
-
-# Rolling correlation chart
-st.subheader("Rolling Correlation (BTC vs ETH)")
-corr_fig = go.Figure()
-corr_fig.add_trace(go.Scatter(x=corr_df.index, y=corr_df["rolling_corr"], mode="lines", name="Rolling Corr"))
-corr_fig.add_hline(y=0, line_dash="dot")
-corr_fig.update_layout(height=260, xaxis_title="Time", yaxis_title="Correlation")
-st.plotly_chart(corr_fig, use_container_width=True)
-
-# Pair spread chart
-st.subheader("Pair Spread (BTC − β × ETH)")
-spread_fig = go.Figure()
-spread_fig.add_trace(go.Scatter(x=spread_df.index, y=spread_df["spread"], mode="lines", name="Spread"))
-spread_fig.update_layout(height=260, xaxis_title="Time", yaxis_title="Spread")
-st.plotly_chart(spread_fig, use_container_width=True)
-
-# Spread z-score chart
-st.subheader("Pair Spread Z-Score")
-pz_fig = go.Figure()
-pz_fig.add_trace(go.Scatter(x=spread_df.index, y=spread_df["spread_zscore"], mode="lines", name="Spread Z"))
-pz_fig.add_hline(y=2, line_dash="dash")
-pz_fig.add_hline(y=-2, line_dash="dash")
-pz_fig.add_hline(y=0, line_dash="dot")
-pz_fig.update_layout(height=260, xaxis_title="Time", yaxis_title="Z-Score")
-st.plotly_chart(pz_fig, use_container_width=True)
-
-# ADF test trigger
-st.subheader("ADF Test (Stationarity Check)")
-if st.button("Run ADF test on Pair Spread"):
-    adf_out = run_adf_test(spread_df["spread"])
-    if "error" in adf_out:
-        st.warning(adf_out["error"])
-    else:
-        st.json(adf_out)
-        if adf_out.get("stationary_at_5pct", False):
-            st.success("✅ Spread looks stationary at 5% significance (p < 0.05).")
-        else:
-            st.error("❌ Spread does NOT look stationary at 5% significance (p >= 0.05).")
-
-# Market regime indicator (only if ADF run)
-if "adf_out" in locals():
-    st.subheader("📊 Market Regime Indicator")
-    msgs = []
-    if adf_out.get("stationary_at_5pct", False):
-        msgs.append("✔ Spread appears stationary (mean-reverting regime).")
-    else:
-        msgs.append("⚠ Spread may NOT be stationary (trend/unstable regime).")
-
-    latest_corr = float(corr_df["rolling_corr"].iloc[-1])
-    if abs(latest_corr) > 0.7:
-        msgs.append("✔ Strong BTC–ETH correlation (pair logic more reliable).")
-    else:
-        msgs.append("⚠ Weak correlation (pair logic less reliable).")
-
-    for m in msgs:
-        st.write(m)
+import asyncio
+import threading
+
+import numpy as np
+import orjson
+import pandas as pd
+import streamlit as st
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from backend.db import get_db, init_db
+from backend.ingestion import run_ingestion
+from backend.analytics import (
+    load_ticks,
+    resample_candles,
+    compute_zscore,
+    compute_rolling_correlation,
+    compute_hedge_ratio,
+    compute_pair_spread,
+    compute_spread_zscore,
+    run_adf_test,
+)
+from backend.fast_rolling import OnlineRollingZ
+
+# ---------------- Helpers ----------------
+def normalize_ohlc_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize OHLC column names to:
+    open, high, low, close, volume
+    Accepts common variants: Open/High/Low/Close/Volume and price/qty.
+    """
+    column_map = {
+        "Open": "open",
+        "High": "high",
+        "Low": "low",
+        "Close": "close",
+        "Volume": "volume",
+        "open": "open",
+        "high": "high",
+        "low": "low",
+        "close": "close",
+        "volume": "volume",
+        "price": "close",
+        "qty": "volume",
+    }
+    # rename returns a new frame sharing the underlying data — no need
+    # to copy the whole OHLCV block just to relabel columns.
+    return df.rename(columns=column_map, copy=False)
+
+
+def ensure_required_candle_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ensure required candle columns exist. If volume missing, fill with 0.
+    """
+    # Already-normalized frames (e.g. straight from resample_candles)
+    # skip the rename and fill work entirely.
+    if all(c in df.columns for c in ("open", "high", "low", "close", "volume")):
+        return df
+
+    df = normalize_ohlc_columns(df)
+
+    if "close" not in df.columns:
+        raise ValueError("OHLC data must contain a 'close' column (or 'Close'/'price').")
+
+    # For uploaded OHLC, volume might be missing; allow charts by filling.
+    # Missing open/high/low are approximated from close (still allows
+    # charts). Added in one concat rather than scalar column inserts.
+    missing_cols = {}
+    if "volume" not in df.columns:
+        missing_cols["volume"] = pd.Series(0.0, index=df.index)
+    for c in ["open", "high", "low"]:
+        if c not in df.columns:
+            missing_cols[c] = df["close"]
+
+    if missing_cols:
+        df = pd.concat(
+            [df, pd.DataFrame(missing_cols, index=df.index)],
+            axis=1,
+            copy=False,
+        )
+
+    return df
+
+
+MAX_CHART_CANDLES = 5000  # cap candles sent to the browser
+
+
+def epoch_ms(index: pd.DatetimeIndex) -> np.ndarray:
+    """
+    DatetimeIndex → int64 epoch milliseconds.
+
+    Plotly date axes accept ms timestamps natively, which skips the
+    per-element datetime stringification when the figure is serialized.
+    """
+    return index.values.astype("datetime64[ms]").astype(np.int64)
+
+
+def fast_figure(fig: go.Figure) -> go.Figure:
+    """
+    Round-trip a figure through orjson's native NumPy serializer.
+
+    plotly.io.to_json converts every trace array element by element via
+    stdlib json; dumping the figure dict once with OPT_SERIALIZE_NUMPY
+    turns the arrays into plain lists up front, so the send path is a
+    straight pass-through.
+    """
+    payload = orjson.dumps(
+        fig.to_plotly_json(), option=orjson.OPT_SERIALIZE_NUMPY
+    )
+    return go.Figure(orjson.loads(payload))
+
+
+def candle_segment_traces(candles: pd.DataFrame) -> list:
+    """
+    Build WebGL line-segment traces for a candle chart.
+
+    go.Candlestick renders via SVG and the browser chokes on thousands
+    of candles; two Scattergl traces per direction (thin wicks, thick
+    bodies) draw the same picture on the GPU.
+    """
+    opens = candles["open"].to_numpy()
+    closes = candles["close"].to_numpy()
+    up = closes >= opens
+
+    traces = []
+    for mask, color, name in ((up, "green", "Up"), (~up, "red", "Down")):
+        sub = candles[mask]
+        if sub.empty:
+            continue
+
+        n = len(sub)
+        # float ms timestamps: NaN makes the segment gap, and numeric x
+        # skips datetime stringification at serialize time.
+        idx_ms = epoch_ms(sub.index)
+        x = np.empty(n * 3, dtype=np.float64)
+        x[0::3] = idx_ms
+        x[1::3] = idx_ms
+        x[2::3] = np.nan
+
+        y_wick = np.empty(n * 3)
+        y_wick[0::3] = sub["high"].to_numpy()
+        y_wick[1::3] = sub["low"].to_numpy()
+        y_wick[2::3] = np.nan
+
+        y_body = np.empty(n * 3)
+        y_body[0::3] = sub["open"].to_numpy()
+        y_body[1::3] = sub["close"].to_numpy()
+        y_body[2::3] = np.nan
+
+        traces.append(
+            go.Scattergl(
+                x=x,
+                y=y_wick,
+                mode="lines",
+                line=dict(color=color, width=1),
+                showlegend=False,
+                hoverinfo="skip",
+            )
+        )
+        traces.append(
+            go.Scattergl(
+                x=x,
+                y=y_body,
+                mode="lines",
+                line=dict(color=color, width=4),
+                name=name,
+            )
+        )
+    return traces
+
+
+# ---------------- Cached data access ----------------
+def _symbol_watermark(symbol: str):
+    """
+    Max ingested timestamp for a symbol — a cheap raw-SQL probe used as
+    the cache key so reruns on unchanged data skip the full reload.
+    """
+    with db.engine.connect() as conn:
+        row = conn.exec_driver_sql(
+            "SELECT MAX(ts) FROM ticks WHERE symbol = ?",
+            (symbol.lower(),),
+        ).fetchone()
+    return row[0]
+
+
+# cache_resource (not cache_data) so the DataFrames are served from the
+# memo without a deepcopy per rerun; callers must not mutate them.
+@st.cache_resource(ttl=2.0, show_spinner=False)
+def cached_ticks(symbol: str, watermark) -> pd.DataFrame:
+    return load_ticks(symbol)
+
+
+@st.cache_resource(ttl=2.0, show_spinner=False)
+def cached_candles(symbol: str, timeframe: str, watermark) -> pd.DataFrame:
+    return resample_candles(cached_ticks(symbol, watermark), timeframe)
+
+
+@st.cache_data(ttl=2.0, show_spinner=False)
+def cached_rolling_correlation(
+    _df1: pd.DataFrame,
+    _df2: pd.DataFrame,
+    window: int,
+    cache_key,
+) -> pd.DataFrame:
+    return compute_rolling_correlation(_df1, _df2, window=window)
+
+
+@st.cache_data(ttl=2.0, show_spinner=False)
+def cached_hedge_ratio(
+    _series_x: pd.Series,
+    _series_y: pd.Series,
+    cache_key,
+) -> float:
+    return compute_hedge_ratio(_series_x, _series_y)
+
+
+def incremental_zscore(candles: pd.DataFrame, state_key: tuple) -> pd.DataFrame:
+    """
+    O(ΔN) z-score for live mode.
+
+    A Welford-style ring-buffer state lives in st.session_state, so a
+    rerun only feeds candles newer than the last one seen through the
+    online calculator. Only completed buckets are folded into the
+    state — the final candle is still forming (its close moves with
+    every tick), so its z-score is peeked transiently each rerun
+    instead of being baked into the window. The state is rebuilt from
+    scratch whenever the symbol, timeframe or window changes.
+    """
+    state = st.session_state.get("online_z")
+    if state is None or state["key"] != state_key:
+        state = {
+            "key": state_key,
+            "calc": OnlineRollingZ(state_key[-1]),
+            "z": pd.Series(dtype=np.float64),
+        }
+        st.session_state.online_z = state
+
+    calc = state["calc"]
+    z = state["z"]
+    completed = candles.iloc[:-1]
+    new = completed if z.empty else completed[completed.index > z.index[-1]]
+    if not new.empty:
+        vals = [calc.update(float(v)) for v in new["close"].to_numpy()]
+        new_z = pd.Series(vals, index=new.index)
+        z = new_z if z.empty else pd.concat([z, new_z])
+        state["z"] = z
+
+    # Shallow copy: the cached frame stays untouched, but the OHLCV
+    # blocks are shared rather than duplicated every rerun.
+    out = candles.copy(deep=False)
+    zscore = z.reindex(candles.index)
+    zscore.iloc[-1] = calc.peek(float(candles["close"].iloc[-1]))
+    out["zscore"] = zscore
+    return out
+
+
+# The spread depends on beta but not the window; the spread z-score
+# depends on both. Keying each stage only on its true inputs means
+# dragging the alert-threshold slider recomputes nothing, and the
+# window slider reruns only the rolling kernels — never the hedge
+# regression or the spread itself.
+@st.cache_data(ttl=2.0, show_spinner=False)
+def cached_pair_spread(
+    _df1: pd.DataFrame,
+    _df2: pd.DataFrame,
+    beta: float,
+    cache_key,
+) -> pd.DataFrame:
+    return compute_pair_spread(_df1, _df2, beta)
+
+
+@st.cache_data(ttl=2.0, show_spinner=False)
+def cached_spread_zscore(
+    _spread_df: pd.DataFrame,
+    window: int,
+    cache_key,
+) -> pd.DataFrame:
+    return compute_spread_zscore(_spread_df, window=window)
+
+
+# adfuller fits lag regressions — tens of ms on long spreads — and users
+# toggle the button repeatedly while the spread barely moves. Key on a
+# content hash of the spread values so repeats are free.
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_adf(spread_hash: int, _spread: pd.Series) -> dict:
+    return run_adf_test(_spread)
+
+
+@st.cache_data(show_spinner=False)
+def parse_uploaded_csv(file_bytes: bytes) -> pd.DataFrame:
+    import io
+
+    return pd.read_csv(io.BytesIO(file_bytes))
+
+
+# ---------------- Page ----------------
+st.set_page_config(page_title="Quant Dashboard", layout="wide")
+st.title("📊 Quant Developer Dashboard")
+
+# ---------------- DB init ----------------
+db = get_db()
+init_db(db)
+
+# ---------------- Auto ingestion (BTC + ETH) ----------------
+@st.cache_resource
+def start_ingestion():
+    def run():
+        asyncio.run(run_ingestion(["btcusdt", "ethusdt"]))
+
+    t = threading.Thread(target=run, daemon=True)
+    t.start()
+
+start_ingestion()
+
+# ---------------- Controls ----------------
+st.subheader("📂 Optional OHLC Upload (CSV)")
+uploaded_file = st.file_uploader("Upload OHLC CSV (optional)", type=["csv"])
+
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    symbol = st.selectbox("Select Symbol (single-asset analytics)", ["btcusdt", "ethusdt"])
+
+with col2:
+    timeframe_label = st.selectbox("Select Timeframe", ["1 Second", "1 Minute", "5 Minutes"])
+
+with col3:
+    regression_type = st.selectbox("Regression Type (pair analytics)", ["OLS"])  # keep OLS stable here
+
+timeframe_map = {
+    "1 Second": "1s",
+    "1 Minute": "1min",
+    "5 Minutes": "5min",
+}
+timeframe = timeframe_map[timeframe_label]
+
+rolling_window = st.slider(
+    "Rolling Window (number of candles)",
+    min_value=10,
+    max_value=300,
+    value=60,
+    step=5,
+)
+
+st.subheader("🚨 Z-Score Alert Settings")
+alert_threshold = st.slider(
+    "Alert when |Z-score| exceeds",
+    min_value=0.5,
+    max_value=5.0,
+    value=2.0,
+    step=0.1,
+)
+
+# ---------------- Load & build candles (primary) ----------------
+candles = None
+candles_source_key = None  # cache key for downstream pair analytics
+
+if uploaded_file is not None:
+    # Upload mode
+    try:
+        file_bytes = uploaded_file.getvalue()
+        df_up = parse_uploaded_csv(file_bytes)
+        candles_source_key = hash(file_bytes)
+        # require a timestamp column
+        # supported names: ts / timestamp / time
+        ts_col = None
+        for c in ["ts", "timestamp", "time", "datetime"]:
+            if c in df_up.columns:
+                ts_col = c
+                break
+        if ts_col is None:
+            st.error("Uploaded CSV must contain a timestamp column: ts OR timestamp OR time OR datetime.")
+            st.stop()
+
+        df_up[ts_col] = pd.to_datetime(df_up[ts_col])
+        df_up = df_up.set_index(ts_col).sort_index()
+
+        candles = ensure_required_candle_columns(df_up)
+
+        st.info("Using uploaded OHLC data (live ingestion still runs in background).")
+    except Exception as e:
+        st.error(f"Failed to read uploaded OHLC CSV: {e}")
+        st.stop()
+else:
+    # Live DB mode
+    watermark = _symbol_watermark(symbol)
+    df_ticks = cached_ticks(symbol, watermark)
+    if df_ticks.empty:
+        st.warning("No data found yet. Live ingestion is running… wait ~5–10 seconds and rerun.")
+        st.stop()
+
+    # resample_candles already emits open/high/low/close/volume — no
+    # normalization pass needed on the live path.
+    candles = cached_candles(symbol, timeframe, watermark)
+    candles_source_key = (symbol, timeframe, watermark)
+
+# Guard
+if candles is None or candles.empty:
+    st.warning("Not enough data to build candles yet.")
+    st.stop()
+
+# Single-asset Z-score (incremental in live mode; uploads are static,
+# so the one-shot kernel is fine there)
+if uploaded_file is not None:
+    candles = compute_zscore(candles, window=rolling_window)
+else:
+    candles = incremental_zscore(candles, (symbol, timeframe, rolling_window))
+
+# ---------------- Pair data (always from DB) ----------------
+watermark_eth = _symbol_watermark("ethusdt")
+df_ticks_eth = cached_ticks("ethusdt", watermark_eth)
+eth_available = not df_ticks_eth.empty
+
+pair_ready = False
+candles_eth = None
+corr_df = None
+beta = None
+spread_df = None
+
+if eth_available:
+    candles_eth = cached_candles("ethusdt", timeframe, watermark_eth)
+
+    # Need enough points for rolling computations
+    if len(candles_eth) >= rolling_window and len(candles) >= rolling_window:
+        pair_ready = True
+    else:
+        st.warning("ETH data exists but not enough candles for pair analytics yet. Keep running for a bit.")
+else:
+    st.warning("ETH data not available yet. Pair analytics will appear once data arrives.")
+
+# ---------------- Pair analytics (only if ready) ----------------
+if pair_ready:
+    pair_key = (candles_source_key, timeframe, watermark_eth)
+
+    corr_df = cached_rolling_correlation(
+        candles, candles_eth, rolling_window, pair_key
+    )
+
+    # Hedge ratio
+    # (regression_type kept as OLS for stability; can be expanded)
+    beta = cached_hedge_ratio(candles["close"], candles_eth["close"], pair_key)
+
+    spread_df = cached_pair_spread(candles, candles_eth, beta, pair_key)
+    spread_df = cached_spread_zscore(spread_df, rolling_window, (pair_key, beta))
+
+# ---------------- Charts (one consolidated figure) ----------------
+# A single subplots figure means one serialize/send per rerun instead
+# of seven component roundtrips, plus synchronized zoom across rows.
+st.subheader(f"Charts — {symbol.upper()} ({timeframe})")
+
+chart_candles = candles
+if len(chart_candles) > MAX_CHART_CANDLES:
+    chart_candles = chart_candles.iloc[-MAX_CHART_CANDLES:]
+
+subplot_titles = ["Price Candles", "Volume", "Z-Score (Rolling)"]
+row_heights = [0.4, 0.2, 0.2]
+if pair_ready:
+    subplot_titles += [
+        "Rolling Correlation (BTC vs ETH)",
+        "Pair Spread (BTC − β × ETH)",
+        "Pair Spread Z-Score",
+    ]
+    row_heights = [0.25, 0.15, 0.15, 0.15, 0.15, 0.15]
+n_rows = len(subplot_titles)
+
+fig = make_subplots(
+    rows=n_rows,
+    cols=1,
+    shared_xaxes=True,
+    vertical_spacing=0.03,
+    subplot_titles=subplot_titles,
+    row_heights=row_heights,
+)
+
+for trace in candle_segment_traces(chart_candles):
+    fig.add_trace(trace, row=1, col=1)
+fig.update_yaxes(title_text="Price", row=1, col=1)
+
+fig.add_trace(
+    go.Bar(x=epoch_ms(candles.index), y=candles["volume"].to_numpy(), name="Volume"),
+    row=2,
+    col=1,
+)
+fig.update_yaxes(title_text="Volume", row=2, col=1)
+
+fig.add_trace(
+    go.Scattergl(
+        x=epoch_ms(candles.index),
+        y=candles["zscore"].to_numpy(),
+        mode="lines",
+        name="Z-Score",
+    ),
+    row=3,
+    col=1,
+)
+fig.add_hline(y=2, line_dash="dash", row=3, col=1)
+fig.add_hline(y=-2, line_dash="dash", row=3, col=1)
+fig.add_hline(y=0, line_dash="dot", row=3, col=1)
+fig.update_yaxes(title_text="Z-Score", row=3, col=1)
+
+if pair_ready:
+    fig.add_trace(
+        go.Scattergl(
+            x=epoch_ms(corr_df.index),
+            y=corr_df["rolling_corr"].to_numpy(),
+            mode="lines",
+            name="Rolling Corr",
+        ),
+        row=4,
+        col=1,
+    )
+    fig.add_hline(y=0, line_dash="dot", row=4, col=1)
+    fig.update_yaxes(title_text="Correlation", row=4, col=1)
+
+    fig.add_trace(
+        go.Scattergl(
+            x=epoch_ms(spread_df.index),
+            y=spread_df["spread"].to_numpy(),
+            mode="lines",
+            name="Spread",
+        ),
+        row=5,
+        col=1,
+    )
+    fig.update_yaxes(title_text="Spread", row=5, col=1)
+
+    fig.add_trace(
+        go.Scattergl(
+            x=epoch_ms(spread_df.index),
+            y=spread_df["spread_zscore"].to_numpy(),
+            mode="lines",
+            name="Spread Z",
+        ),
+        row=6,
+        col=1,
+    )
+    fig.add_hline(y=2, line_dash="dash", row=6, col=1)
+    fig.add_hline(y=-2, line_dash="dash", row=6, col=1)
+    fig.add_hline(y=0, line_dash="dot", row=6, col=1)
+    fig.update_yaxes(title_text="Z-Score", row=6, col=1)
+
+fig.update_layout(height=260 * n_rows, showlegend=False)
+fig.update_xaxes(type="date")  # x arrays are epoch-ms numbers
+fig.update_xaxes(title_text="Time", row=n_rows, col=1)
+st.plotly_chart(fast_figure(fig), use_container_width=True)
+
+# Alerts (single asset)
+latest_z = float(candles["zscore"].iloc[-1])
+if abs(latest_z) >= alert_threshold:
+    st.error(f"🚨 ALERT: |Z-score| = {latest_z:.2f} exceeds threshold {alert_threshold}")
+else:
+    st.success(f"Z-score normal: {latest_z:.2f}")
+
+# ---------------- Pair section (only show if ready) ----------------
+st.divider()
+st.subheader("Pair Analytics (BTC vs ETH)")
+
+if not pair_ready:
+    st.info("Pair analytics will appear automatically once ETH candles are available and sufficient for the rolling window.")
+    st.stop()
+
+# Hedge ratio metric
+st.subheader("📐 Hedge Ratio (OLS)")
+if beta is None or pd.isna(beta):
+    st.metric("BTC ~ β × ETH", "Waiting…")
+else:
+    st.metric("BTC ~ β × ETH", f"{beta:.4f}")
+
+# Trading signal summary (brownie points)
+st.subheader("🧠 Trading Signal Summary")
+latest_spread_z = float(spread_df["spread_zscore"].iloc[-1])
+
+if latest_spread_z <= -2:
+    st.success(
+        f"📈 MEAN-REVERSION BUY SIGNAL\n\n"
+        f"Spread Z-Score = {latest_spread_z:.2f}\n"
+        f"Interpretation: Spread is significantly BELOW mean."
+    )
+elif latest_spread_z >= 2:
+    st.error(
+        f"📉 MEAN-REVERSION SELL SIGNAL\n\n"
+        f"Spread Z-Score = {latest_spread_z:.2f}\n"
+        f"Interpretation: Spread is significantly ABOVE mean."
+    )
+else:
+    st.info(
+        f"⚖️ NEUTRAL / NO-TRADE ZONE\n\n"
+        f"Spread Z-Score = {latest_spread_z:.2f}\n"
+        f"Interpretation: Spread within normal range."
+    )
+
+# ADF test trigger
+st.subheader("ADF Test (Stationarity Check)")
+if st.button("Run ADF test on Pair Spread"):
+    spread = spread_df["spread"]
+    adf_out = cached_adf(hash(spread.to_numpy().tobytes()), spread)
+    if "error" in adf_out:
+        st.warning(adf_out["error"])
+    else:
+        st.json(adf_out)
+        if adf_out.get("stationary_at_5pct", False):
+            st.success("✅ Spread looks stationary at 5% significance (p < 0.05).")
+        else:
+            st.error("❌ Spread does NOT look stationary at 5% significance (p >= 0.05).")
+
+# Market regime indicator (only if ADF run)
+if "adf_out" in locals():
+    st.subheader("📊 Market Regime Indicator")
+    msgs = []
+    if adf_out.get("stationary_at_5pct", False):
+        msgs.append("✔ Spread appears stationary (mean-reverting regime).")
+    else:
+        msgs.append("⚠ Spread may NOT be stationary (trend/unstable regime).")
+
+    latest_corr = float(corr_df["rolling_corr"].iloc[-1])
+    if abs(latest_corr) > 0.7:
+        msgs.append("✔ Strong BTC–ETH correlation (pair logic more reliable).")
+    else:
+        msgs.append("⚠ Weak correlation (pair logic less reliable).")
+
+    for m in msgs:
+        st.write(m)
@@ -1,162 +1,191 @@
-import numpy as np
-import pandas as pd
-import statsmodels.api as sm
-from statsmodels.tsa.stattools import adfuller
-
-
-# ===============================
-# LOAD TICKS FROM DATABASE
-# ===============================
-def load_ticks(symbol: str) -> pd.DataFrame:
-    from backend.db import get_db, fetch_recent_ticks
-
-    db = get_db()
-    rows = fetch_recent_ticks(db, symbol, limit=10000)
-
-    if not rows:
-        return pd.DataFrame()
-
-    df = pd.DataFrame(
-        {
-            "ts": [r.ts for r in rows],
-            "price": [r.price for r in rows],
-            "qty": [r.qty for r in rows],
-        }
-    )
-
-    df["ts"] = pd.to_datetime(df["ts"])
-    df = df.set_index("ts").sort_index()
-    return df
-
-
-# ===============================
-# RESAMPLE TICKS → OHLC
-# ===============================
-def resample_candles(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
-    if df.empty:
-        return pd.DataFrame()
-
-    ohlc = df["price"].resample(timeframe).ohlc()
-    volume = df["qty"].resample(timeframe).sum()
-
-    candles = ohlc.join(volume)
-    candles.columns = ["open", "high", "low", "close", "volume"]
-    candles = candles.dropna()
-    return candles
-
-
-# ===============================
-# Z-SCORE
-# ===============================
-def compute_zscore(candles: pd.DataFrame, window: int = 60) -> pd.DataFrame:
-    df = candles.copy()
-
-    mean = df["close"].rolling(window).mean()
-    std = df["close"].rolling(window).std()
-
-    df["zscore"] = (df["close"] - mean) / std
-    return df
-
-
-# ===============================
-# ROLLING CORRELATION
-# ===============================
-def compute_rolling_correlation(
-    df1: pd.DataFrame, df2: pd.DataFrame, window: int = 60
-) -> pd.DataFrame:
-
-    merged = pd.DataFrame(index=df1.index)
-    merged["close"] = df1["close"]
-    merged["other_close"] = df2["close"]
-
-    merged = merged.dropna()
-
-    if len(merged) < window:
-        merged["rolling_corr"] = np.nan
-        return merged
-
-    merged["rolling_corr"] = merged["close"].rolling(window).corr(
-        merged["other_close"]
-    )
-    return merged
-
-
-# ===============================
-# SAFE HEDGE RATIO (NO CRASH)
-# ===============================
-def compute_hedge_ratio(
-    series_x: pd.Series,
-    series_y: pd.Series,
-    min_points: int = 20,
-) -> float:
-    """
-    SAFE OLS hedge ratio.
-    Returns NaN if insufficient overlapping data.
-    """
-
-    x, y = series_x.align(series_y, join="inner")
-    x = x.dropna()
-    y = y.dropna()
-
-    # 🚨 ABSOLUTE SAFETY CHECK
-    if len(x) < min_points or len(y) < min_points:
-        return np.nan
-
-    X = sm.add_constant(x.values)
-    y_vals = y.values
-
-    try:
-        model = sm.OLS(y_vals, X).fit()
-        return float(model.params[1])
-    except Exception:
-        return np.nan
-
-
-# ===============================
-# PAIR SPREAD
-# ===============================
-def compute_pair_spread(
-    df1: pd.DataFrame,
-    df2: pd.DataFrame,
-    beta: float,
-) -> pd.DataFrame:
-
-    if np.isnan(beta):
-        return pd.DataFrame()
-
-    spread = df1["close"] - beta * df2["close"]
-    return pd.DataFrame({"spread": spread})
-
-
-def compute_spread_zscore(
-    spread_df: pd.DataFrame,
-    window: int = 60,
-) -> pd.DataFrame:
-
-    if spread_df.empty:
-        return spread_df
-
-    mean = spread_df["spread"].rolling(window).mean()
-    std = spread_df["spread"].rolling(window).std()
-
-    spread_df["spread_zscore"] = (spread_df["spread"] - mean) / std
-    return spread_df
-
-
-# ===============================
-# ADF TEST
-# ===============================
-def run_adf_test(series: pd.Series) -> dict:
-    series = series.dropna()
-
-    if len(series) < 20:
-        return {"error": "Not enough data for ADF test"}
-
-    stat, pval, _, _, crit, _ = adfuller(series)
-
-    return {
-        "adf_statistic": stat,
-        "p_value": pval,
-        "critical_values": crit,
-        "stationary_at_5pct": pval < 0.05,
-    }
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.stattools import adfuller
+
+from backend.fast_rolling import rolling_corr, rolling_zscore
+
+
+# ===============================
+# LOAD TICKS FROM DATABASE
+# ===============================
+def load_ticks(symbol: str) -> pd.DataFrame:
+    from backend.db import get_db, fetch_recent_ticks
+
+    db = get_db()
+    rows = fetch_recent_ticks(db, symbol, limit=10000)
+
+    if not rows:
+        return pd.DataFrame()
+
+    # Build contiguous columns straight from the row tuples instead of
+    # letting pandas round-trip a records table and infer dtypes.
+    # float32 halves the bandwidth for storage and resampling; the
+    # rolling kernels still get float64 input at their call sites —
+    # squaring float32 prices (~1e10) loses digits before the
+    # accumulators can help.
+    n = len(rows)
+    price = np.fromiter((r[1] for r in rows), dtype=np.float32, count=n)
+    qty = np.fromiter((r[2] for r in rows), dtype=np.float32, count=n)
+    ts = pd.DatetimeIndex(pd.to_datetime([r[0] for r in rows]), name="ts")
+
+    df = pd.DataFrame({"price": price, "qty": qty}, index=ts, copy=False)
+    return df.sort_index()
+
+
+# ===============================
+# RESAMPLE TICKS → OHLC
+# ===============================
+def resample_candles(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    if df.empty:
+        return pd.DataFrame()
+
+    # Group by integer bucket labels instead of resample(): one pass over
+    # hashed groups, and sparse tick streams never materialize empty bins.
+    # Normalize the index to ns first — depending on how it was parsed it
+    # may carry us (or other) resolution, and raw i8 views would then be
+    # off by orders of magnitude.
+    freq_ns = pd.Timedelta(timeframe).value
+    bucket = df.index.as_unit("ns").asi8 // freq_ns
+
+    g = df.groupby(bucket)
+    candles = g["price"].agg(
+        open="first", high="max", low="min", close="last"
+    )
+    candles["volume"] = g["qty"].sum()
+
+    candles.index = pd.DatetimeIndex(
+        (candles.index * freq_ns).to_numpy().view("datetime64[ns]")
+    )
+    return candles
+
+
+# ===============================
+# Z-SCORE
+# ===============================
+def compute_zscore(candles: pd.DataFrame, window: int = 60) -> pd.DataFrame:
+    # Assigns the zscore column onto the passed frame — callers own it,
+    # so there is no need to duplicate the whole OHLCV block first.
+    candles["zscore"] = rolling_zscore(
+        candles["close"].to_numpy(dtype=np.float64), window
+    )
+    return candles
+
+
+# ===============================
+# ROLLING CORRELATION
+# ===============================
+def compute_rolling_correlation(
+    df1: pd.DataFrame, df2: pd.DataFrame, window: int = 60
+) -> pd.DataFrame:
+
+    merged = pd.DataFrame(index=df1.index)
+    merged["close"] = df1["close"]
+    merged["other_close"] = df2["close"]
+
+    merged = merged.dropna()
+
+    if len(merged) < window:
+        merged["rolling_corr"] = np.nan
+        return merged
+
+    merged["rolling_corr"] = rolling_corr(
+        merged["close"].to_numpy(dtype=np.float64),
+        merged["other_close"].to_numpy(dtype=np.float64),
+        window,
+    )
+    return merged
+
+
+# ===============================
+# SAFE HEDGE RATIO (NO CRASH)
+# ===============================
+def compute_hedge_ratio(
+    series_x: pd.Series,
+    series_y: pd.Series,
+    min_points: int = 20,
+) -> float:
+    """
+    SAFE OLS hedge ratio.
+    Returns NaN if insufficient overlapping data.
+    """
+
+    x, y = series_x.align(series_y, join="inner")
+
+    # Drop NaNs jointly — dropping each side separately can leave
+    # mismatched lengths when a NaN sits in only one series.
+    valid = x.notna() & y.notna()
+    x = x[valid]
+    y = y[valid]
+
+    # 🚨 ABSOLUTE SAFETY CHECK
+    if len(x) < min_points or len(y) < min_points:
+        return np.nan
+
+    # Closed-form β = cov(x, y) / var(x) — identical to OLS with an
+    # intercept for a univariate regression, without the statsmodels
+    # model/results machinery.
+    xv = x.to_numpy(dtype=np.float64)
+    yv = y.to_numpy(dtype=np.float64)
+    dx = xv - xv.mean()
+    denom = float((dx * dx).sum())
+
+    if denom == 0.0:
+        return np.nan
+
+    return float((dx * (yv - yv.mean())).sum() / denom)
+
+
+# ===============================
+# PAIR SPREAD
+# ===============================
+def compute_pair_spread(
+    df1: pd.DataFrame,
+    df2: pd.DataFrame,
+    beta: float,
+) -> pd.DataFrame:
+
+    if np.isnan(beta):
+        return pd.DataFrame()
+
+    # Both frames usually share the resampled grid already — subtract
+    # raw arrays and skip pandas' per-call index alignment, falling back
+    # to an explicit reindex only on mismatched indices.
+    other = df2["close"]
+    if not df1.index.equals(other.index):
+        other = other.reindex(df1.index, copy=False)
+
+    spread = df1["close"].to_numpy() - beta * other.to_numpy()
+    return pd.DataFrame({"spread": spread}, index=df1.index)
+
+
+def compute_spread_zscore(
+    spread_df: pd.DataFrame,
+    window: int = 60,
+) -> pd.DataFrame:
+
+    if spread_df.empty:
+        return spread_df
+
+    spread_df["spread_zscore"] = rolling_zscore(
+        spread_df["spread"].to_numpy(dtype=np.float64), window
+    )
+    return spread_df
+
+
+# ===============================
+# ADF TEST
+# ===============================
+def run_adf_test(series: pd.Series) -> dict:
+    series = series.dropna()
+
+    if len(series) < 20:
+        return {"error": "Not enough data for ADF test"}
+
+    stat, pval, _, _, crit, _ = adfuller(series)
+
+    return {
+        "adf_statistic": stat,
+        "p_value": pval,
+        "critical_values": crit,
+        "stationary_at_5pct": pval < 0.05,
+    }
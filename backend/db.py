@@ -2,8 +2,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional
 
+from sqlalchemy.pool import StaticPool
 from sqlalchemy import (
     create_engine,
     Integer,
@@ -32,6 +34,9 @@ class Tick(Base):
 
 
 Index("ix_ticks_symbol_ts", Tick.symbol, Tick.ts)
+# Matches the ORDER BY ts DESC in fetch_recent_ticks so SQLite walks the
+# index in order instead of sorting.
+Index("ix_ticks_symbol_ts_desc", Tick.symbol, Tick.ts.desc())
 
 
 @dataclass
@@ -41,11 +46,21 @@ class DB:
     SessionLocal: any
 
 
+@lru_cache(maxsize=1)
 def get_db() -> DB:
+    # Singleton: get_db is called from the app top-level, every tick
+    # insert and every analytics load — building an engine and pool each
+    # time is wasted work, and a shared StaticPool connection keeps the
+    # PRAGMAs set in init_db in effect across threads.
     DATA_DIR.mkdir(parents=True, exist_ok=True)
 
     engine_url = f"sqlite:///{DB_PATH}"
-    engine = create_engine(engine_url, future=True)
+    engine = create_engine(
+        engine_url,
+        future=True,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
     SessionLocal = sessionmaker(
         bind=engine, autoflush=False, autocommit=False, future=True
     )
@@ -54,6 +69,11 @@ def get_db() -> DB:
 
 def init_db(db: DB) -> None:
     Base.metadata.create_all(bind=db.engine)
+    # WAL avoids an fsync per commit and lets the dashboard read while
+    # ingestion writes.
+    with db.engine.begin() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+        conn.exec_driver_sql("PRAGMA synchronous=NORMAL")
 
 
 def now_utc() -> datetime:
@@ -81,12 +101,23 @@ def insert_tick(
         session.commit()
 
 
+def insert_ticks(db: DB, rows: list[dict]) -> None:
+    """Bulk-insert pre-built tick rows in a single transaction."""
+    if not rows:
+        return
+    with db.engine.begin() as conn:
+        conn.execute(Tick.__table__.insert(), rows)
+
+
 def fetch_recent_ticks(db: DB, symbol: str, limit: int = 200):
-    with db.SessionLocal() as session:
-        return (
-            session.query(Tick)
-            .filter(Tick.symbol == symbol.lower())
-            .order_by(Tick.ts.desc())
-            .limit(limit)
-            .all()
-        )
+    """Return the newest ticks as plain (ts, price, qty) tuples.
+
+    Raw DBAPI fetch — materializing thousands of ORM Tick objects per
+    query is pure overhead for read-only analytics.
+    """
+    with db.engine.connect() as conn:
+        return conn.exec_driver_sql(
+            "SELECT ts, price, qty FROM ticks"
+            " WHERE symbol = ? ORDER BY ts DESC LIMIT ?",
+            (symbol.lower(), limit),
+        ).fetchall()
@@ -0,0 +1,184 @@
+import numpy as np
+from numba import njit
+
+
+# ===============================
+# ONLINE ROLLING Z-SCORE
+# ===============================
+class OnlineRollingZ:
+    """
+    Online rolling z-score over a fixed window.
+
+    Ring buffer plus running sum/sum-of-squares, so a live stream can
+    extend the stat one value at a time (O(1) per update) instead of
+    recomputing the whole history every refresh.
+    """
+
+    __slots__ = ("w", "buf", "pos", "n", "s", "s2")
+
+    def __init__(self, w: int):
+        self.w = w
+        self.buf = np.zeros(w, dtype=np.float64)
+        self.pos = 0
+        self.n = 0
+        self.s = 0.0
+        self.s2 = 0.0
+
+    def update(self, x: float) -> float:
+        if self.n == self.w:
+            old = self.buf[self.pos]
+            self.s -= old
+            self.s2 -= old * old
+        else:
+            self.n += 1
+
+        self.buf[self.pos] = x
+        self.pos = (self.pos + 1) % self.w
+        self.s += x
+        self.s2 += x * x
+
+        if self.n < self.w:
+            return np.nan
+
+        mean = self.s / self.w
+        var = (self.s2 - mean * mean * self.w) / (self.w - 1)
+        if var <= 0.0:
+            return np.nan
+        return (x - mean) / np.sqrt(var)
+
+    def peek(self, x: float) -> float:
+        """
+        Z-score x would receive from update(x), without mutating the
+        state — for values that are still forming (e.g. the live,
+        partial candle) and must not be baked into the window yet.
+        """
+        if self.n == self.w:
+            old = self.buf[self.pos]
+            s = self.s - old + x
+            s2 = self.s2 - old * old + x * x
+        else:
+            if self.n + 1 < self.w:
+                return np.nan
+            s = self.s + x
+            s2 = self.s2 + x * x
+
+        mean = s / self.w
+        var = (s2 - mean * mean * self.w) / (self.w - 1)
+        if var <= 0.0:
+            return np.nan
+        return (x - mean) / np.sqrt(var)
+
+
+# ===============================
+# ROLLING Z-SCORE (single pass)
+# ===============================
+# fastmath subset: full fastmath implies nnan, which compiles the
+# np.isnan guards to constant False and lets NaNs poison the sums.
+@njit(cache=True, fastmath={"contract", "reassoc", "arcp", "nsz"})
+def rolling_zscore(x: np.ndarray, w: int) -> np.ndarray:
+    """
+    Rolling z-score over a window of w points in one pass.
+
+    Maintains a running sum and sum-of-squares, adding the entering
+    value and subtracting the leaving one, instead of recomputing
+    mean/std per window like pandas rolling does. NaNs are counted
+    rather than accumulated, so the stat recovers as soon as the last
+    NaN leaves the window (matching pandas rolling).
+    """
+    n = len(x)
+    out = np.empty(n, dtype=np.float64)
+
+    s = 0.0
+    s2 = 0.0
+    nan_count = 0
+
+    for i in range(n):
+        v = x[i]
+        if np.isnan(v):
+            nan_count += 1
+        else:
+            s += v
+            s2 += v * v
+
+        if i >= w:
+            old = x[i - w]
+            if np.isnan(old):
+                nan_count -= 1
+            else:
+                s -= old
+                s2 -= old * old
+
+        if i >= w - 1 and nan_count == 0:
+            mean = s / w
+            var = (s2 - mean * mean * w) / (w - 1)
+            if var > 0.0:
+                out[i] = (v - mean) / np.sqrt(var)
+            else:
+                out[i] = np.nan
+        else:
+            out[i] = np.nan
+
+    return out
+
+
+# ===============================
+# ROLLING CORRELATION (single pass)
+# ===============================
+# Same fastmath subset as rolling_zscore — nnan would erase the isnan
+# guards here too.
+@njit(cache=True, fastmath={"contract", "reassoc", "arcp", "nsz"})
+def rolling_corr(x: np.ndarray, y: np.ndarray, w: int) -> np.ndarray:
+    """
+    Rolling Pearson correlation over a window of w points in one pass.
+
+    Keeps five running accumulators (sums, sums of squares, cross
+    products) updated incrementally, avoiding pandas' per-window
+    recomputation in rolling().corr(). Pairs with a NaN on either side
+    are counted out of the accumulators so the stat recovers once the
+    NaN leaves the window.
+    """
+    n = len(x)
+    out = np.empty(n, dtype=np.float64)
+
+    sx = 0.0
+    sy = 0.0
+    sxx = 0.0
+    syy = 0.0
+    sxy = 0.0
+    nan_count = 0
+
+    for i in range(n):
+        xv = x[i]
+        yv = y[i]
+        if np.isnan(xv) or np.isnan(yv):
+            nan_count += 1
+        else:
+            sx += xv
+            sy += yv
+            sxx += xv * xv
+            syy += yv * yv
+            sxy += xv * yv
+
+        if i >= w:
+            xo = x[i - w]
+            yo = y[i - w]
+            if np.isnan(xo) or np.isnan(yo):
+                nan_count -= 1
+            else:
+                sx -= xo
+                sy -= yo
+                sxx -= xo * xo
+                syy -= yo * yo
+                sxy -= xo * yo
+
+        if i >= w - 1 and nan_count == 0:
+            num = w * sxy - sx * sy
+            den = np.sqrt((w * sxx - sx * sx) * (w * syy - sy * sy))
+            if den > 0.0:
+                out[i] = num / den
+            else:
+                out[i] = np.nan
+        else:
+            out[i] = np.nan
+
+    return out